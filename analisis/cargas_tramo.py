@@ -2,12 +2,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import List
+import numpy as np
 import pandas as pd
-import math
-from .viento import viento_kN_m, proyectar_viento
+from .viento import viento_kN_m, proyectar_viento_array
 from .mecanica import peso_lineal_kN_m
-from .viento import proyectar_viento
 
 
 def calcular_cargas_por_tramo(
@@ -70,32 +68,24 @@ def calcular_cargas_por_tramo(
     )
 
     # ------------------------------
-    # 3) Proyección por tramo
+    # 3) Proyección por tramo (todos los tramos a la vez)
     # ------------------------------
-    w_eff_list: List[float] = []
-    w_res_list: List[float] = []
-
-    for az_tramo in out["Azimut (°)"].astype(float).tolist():
-        w_eff = proyectar_viento(
-            w_kN_m=w_viento,
-            azimut_tramo_deg=float(az_tramo),
-            azimut_viento_deg=float(azimut_viento_deg),
-        )
-        w_eff_list.append(float(w_eff))
-        w_res_list.append(math.sqrt(w_peso ** 2 + w_eff ** 2))
+    w_eff = proyectar_viento_array(
+        w_viento,
+        out["Azimut (°)"].to_numpy(dtype=float),
+        float(azimut_viento_deg),
+    )
+    w_res = np.sqrt(w_peso ** 2 + w_eff ** 2)
 
     # ------------------------------
     # 4) Resultados
     # ------------------------------
     out["w_peso (kN/m)"] = w_peso
     out["w_viento (kN/m)"] = w_viento
-    out["w_viento_eff (kN/m)"] = w_eff_list
-    out["w_resultante (kN/m)"] = w_res_list
+    out["w_viento_eff (kN/m)"] = w_eff
+    out["w_resultante (kN/m)"] = w_res
 
-    out["W_resultante_tramo (kN)"] = (
-        out["w_resultante (kN/m)"].astype(float)
-        * out["Distancia (m)"].astype(float)
-    )
+    out["W_resultante_tramo (kN)"] = w_res * out["Distancia (m)"].to_numpy(dtype=float)
 
     # Metadato técnico (útil para reportes)
     out["Modelo viento"] = "Aerodinámico (0.5·ρ·Cd·D·v²)"
@@ -9,7 +9,8 @@ etc., debe implementarse en módulos aparte (por ejemplo: analisis/normas.py o a
 """
 
 from __future__ import annotations
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 
 # ============================================================
 # Conductores ACSR (peso y tensión de ruptura)
@@ -50,6 +51,16 @@ CAP_RETENIDA_ULT_LBF: Dict[str, float] = {
     '3/8" EHS':  17000,
 }
 
+# ============================================================
+# Alturas de poste para dibujo del perfil (m)
+# (Solo lectura: compartida entre reruns, no se reconstruye)
+# ============================================================
+
+ALTURA_POSTE_DIBUJO_M: Mapping[str, float] = MappingProxyType({
+    "PC-30": 9.0, "PC-35": 10.5, "PC-40": 12.0, "PC-40A": 12.0, "PC-45": 13.5, "PC-50": 15.0,
+    "PM-30": 9.0, "PM-35": 10.5, "PM-40": 12.0, "PM-45": 13.5, "PM-50": 15.0,
+})
+
 # ============================================================
 # Norma / Especificación: Postes de concreto (TABLA 1)
 # (Datos “crudos”: sin conversiones, sin cálculos)
@@ -17,9 +17,10 @@ ORDEN LÓGICO DEL ENGINE
 from __future__ import annotations
 
 from typing import Dict, Any
+import numpy as np
 import pandas as pd
 from .norma_postes import h_amarre_norma_m
-from .geometria import calcular_tramos, calcular_deflexiones, clasificar_por_angulo
+from .geometria import calcular_tramos, calcular_deflexiones, clasificar_por_angulo_array
 from .cargas_tramo import calcular_cargas_por_tramo
 from .fuerzas_nodo import calcular_fuerzas_en_nodos
 from .retenidas import calcular_retenidas, ParamsRetenida
@@ -28,7 +29,7 @@ from .cimentacion import evaluar_cimentacion
 from .momento_poste import calcular_momento_poste
 from .decision_soporte import decidir_soporte
 from .perfil import analizar_perfil
-from .norma_postes import h_amarre_tipica_m
+from .norma_postes import h_amarre_tipica_m_serie
 
 
 # =============================================================================
@@ -56,21 +57,14 @@ def _calcular_deflexion_real(df_def: pd.DataFrame) -> pd.DataFrame:
     if df_def is None or df_def.empty or "Deflexión (°)" not in df_def.columns:
         return df_def
 
-    deflex_real = []
-    for a in df_def["Deflexión (°)"].tolist():
-        try:
-            deflex_real.append(abs(180.0 - float(a)))
-        except Exception:
-            deflex_real.append(0.0)
+    deflex_real = np.abs(180.0 - pd.to_numeric(df_def["Deflexión (°)"], errors="coerce").to_numpy(dtype=float))
 
     out = df_def.copy()
-    out["Deflexión (°)"] = [round(d, 1) for d in deflex_real]
+    # round() de Python (no np.round) para conservar el redondeo de los medios
+    out["Deflexión (°)"] = np.array([round(d, 1) for d in deflex_real.tolist()], dtype=float)
 
-    estructuras, retenidas = [], []
-    for d in deflex_real:
-        est, ret = clasificar_por_angulo(float(d))
-        estructuras.append(est)
-        retenidas.append(ret)
+    # Clasificación de toda la columna de una vez
+    estructuras, retenidas = clasificar_por_angulo_array(deflex_real)
 
     out["Estructura"] = estructuras
     out["Retenidas"] = retenidas
@@ -80,21 +74,27 @@ def _calcular_deflexion_real(df_def: pd.DataFrame) -> pd.DataFrame:
 def _armar_resumen(df: pd.DataFrame, df_def: pd.DataFrame) -> pd.DataFrame:
     # remates en extremos
     resumen = df[["Punto", "Poste", "Espacio Retenida"]].copy()
-    resumen["Deflexión (°)"] = "-"
+    # Deflexión numérica (float64): NaN en remates, la UI lo muestra como "-"
+    resumen["Deflexión (°)"] = np.nan
     resumen["Estructura"] = "Remate"
     resumen["Retenidas"] = 1
 
     if df_def is None or df_def.empty or "Punto" not in df_def.columns:
         return resumen
 
-    # puntos internos toman df_def
-    mapa = df_def.set_index("Punto")[["Deflexión (°)", "Estructura", "Retenidas"]]
-    for i in range(1, len(resumen) - 1):
-        p = str(resumen.loc[i, "Punto"])
-        if p in mapa.index:
-            resumen.loc[i, "Deflexión (°)"] = mapa.loc[p, "Deflexión (°)"]
-            resumen.loc[i, "Estructura"] = mapa.loc[p, "Estructura"]
-            resumen.loc[i, "Retenidas"] = int(mapa.loc[p, "Retenidas"])
+    # puntos internos toman df_def (un solo reindex, sin .loc fila a fila)
+    mapa = df_def.drop_duplicates("Punto").set_index("Punto")[["Deflexión (°)", "Estructura", "Retenidas"]]
+    fila = mapa.reindex(resumen["Punto"].astype(str))
+
+    internos = np.zeros(len(resumen), dtype=bool)
+    internos[1:-1] = True
+    usar = internos & fila["Estructura"].notna().to_numpy()
+
+    # Conversión de columna completa (no celda a celda)
+    deflex = pd.to_numeric(fila["Deflexión (°)"], errors="coerce").to_numpy(dtype=float)
+    resumen.loc[usar, "Deflexión (°)"] = deflex[usar]
+    resumen.loc[usar, "Estructura"] = fila["Estructura"].to_numpy()[usar]
+    resumen.loc[usar, "Retenidas"] = fila["Retenidas"].to_numpy()[usar].astype("int64")
 
     return resumen
 
@@ -102,11 +102,12 @@ def _armar_resumen(df: pd.DataFrame, df_def: pd.DataFrame) -> pd.DataFrame:
 def ejecutar_fase_geometria(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     _validar_entrada(df)
 
-    puntos = list(zip(df["X"].tolist(), df["Y"].tolist()))
-    etiquetas = df["Punto"].tolist()
+    # Columnas directo a numpy (sin listas de tuplas intermedias)
+    xy = df[["X", "Y"]].to_numpy(dtype=np.float64)
+    etiquetas = df["Punto"].to_numpy()
 
-    df_tramos = calcular_tramos(puntos, etiquetas)
-    df_def = calcular_deflexiones(puntos, etiquetas)
+    df_tramos = calcular_tramos(xy, etiquetas)
+    df_def = calcular_deflexiones(xy, etiquetas)
     df_def = _calcular_deflexion_real(df_def)
 
     resumen = _armar_resumen(df, df_def)
@@ -165,12 +166,13 @@ def _armar_df_nodos(resumen: pd.DataFrame, fuerzas: pd.DataFrame) -> pd.DataFram
         on="Punto",
         how="left",
     )
-    df_nodos["h_amarre (m)"] = df_nodos["Poste"].apply(lambda p: float(h_amarre_tipica_m(str(p))))
+    df_nodos["h_amarre (m)"] = h_amarre_tipica_m_serie(df_nodos["Poste"])
 
     # columna booleana (contrato explícito)
     df_nodos["Retenidas_aplican"] = (
         (df_nodos["Retenidas"].astype(int) > 0) &
-        (df_nodos["Espacio Retenida"].apply(_si_no))
+        # map: con dtype category se evalúa una vez por categoría
+        df_nodos["Espacio Retenida"].map(_si_no).eq(True).to_numpy()
     )
     return df_nodos
 
@@ -258,9 +260,7 @@ def ejecutar_todo(
         )
 
     if "h_amarre (m)" not in df_ret.columns or df_ret["h_amarre (m)"].isna().any():
-        df_ret["h_amarre (m)"] = df_ret["Poste"].apply(
-            lambda p: h_amarre_tipica_m(str(p))
-        )
+        df_ret["h_amarre (m)"] = h_amarre_tipica_m_serie(df_ret["Poste"])
 
     geo["retenidas"] = df_ret
 
@@ -0,0 +1,29 @@
+# analisis/formatos.py
+# -*- coding: utf-8 -*-
+"""
+Decimales de presentación por columna (los resultados se guardan sin redondear).
+Compartido por la UI (Styler) y el reporte PDF.
+"""
+from __future__ import annotations
+
+from typing import Dict
+
+# Tabla de vanos (perfil)
+FMT_TABLA_VANOS: Dict[str, str] = {
+    "Longitud (m)": "{:.2f}",
+    "wv (kN/m)": "{:.5f}",
+    "H (kN)": "{:.3f}",
+    "Ts (kN)": "{:.3f}",
+    "Sag f (m)": "{:.3f}",
+    "Despeje mín (m)": "{:.3f}",
+}
+
+# Retenidas
+FMT_TABLA_RETENIDAS: Dict[str, str] = {
+    "T_retenida (kN)": "{:.4f}",
+    "H_aporte_ret (kN)": "{:.4f}",
+    "V_retenida (kN)": "{:.4f}",
+    "H_poste_con_ret (kN)": "{:.4f}",
+    "T_admisible_retenida (kN)": "{:.4f}",
+    "Utilización retenida (%)": "{:.1f}",
+}
@@ -70,12 +70,19 @@ def opuesta_deg(az: float) -> float:
 # =========================
 # Tramos
 # =========================
+def _como_xy(puntos) -> np.ndarray:
+    """Lista de (x, y) o array (n, 2) -> array float (n, 2)."""
+    return np.asarray(puntos, dtype=float).reshape(-1, 2)
+
+
 def calcular_tramos(
-    puntos: List[Point],
-    etiquetas: List[str] | None = None
+    puntos: np.ndarray | List[Point],
+    etiquetas: np.ndarray | List[str] | None = None
 ) -> pd.DataFrame:
     """
-    Calcula distancias, acumulado y azimut por tramo.
+    Calcula distancias, acumulado y azimut por tramo (vectorizado).
+
+    Recibe un array (n, 2) de coordenadas (o lista de puntos).
 
     Retorna DataFrame con:
     - Tramo
@@ -85,78 +92,89 @@ def calcular_tramos(
     - Acumulado (m)
     - Azimut (°)
     """
-    if len(puntos) < 2:
+    xy = _como_xy(puntos)
+    n = len(xy)
+    if n < 2:
         raise ValueError("Se requieren al menos 2 puntos para calcular tramos.")
 
-    filas = []
-    acumulado = 0.0
-
-    for i in range(len(puntos) - 1):
-        p1 = puntos[i]
-        p2 = puntos[i + 1]
-
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        d = dist_utm(p1, p2)
-        az = azimut_deg(p1, p2)
+    dx = np.diff(xy[:, 0])
+    dy = np.diff(xy[:, 1])
+    d = np.hypot(dx, dy)
+    az = np.degrees(np.arctan2(dy, dx)) % 360
 
-        acumulado += d
-
-        nombre = (
-            f"{etiquetas[i]} → {etiquetas[i+1]}"
-            if etiquetas
-            else f"P{i+1} → P{i+2}"
-        )
-
-        filas.append({
-            "Tramo": nombre,
-            "ΔX (m)": dx,
-            "ΔY (m)": dy,
-            "Distancia (m)": d,
-            "Acumulado (m)": acumulado,
-            "Azimut (°)": az,
-        })
-
-    df = pd.DataFrame(filas)
+    if etiquetas is not None and len(etiquetas) > 0:
+        etq = pd.Series(etiquetas, dtype=object).astype(str).to_numpy()
+    else:
+        etq = np.array([f"P{i + 1}" for i in range(n)], dtype=object)
+    nombres = etq[:-1] + " → " + etq[1:]
 
     # Redondeo solo para presentación
-    for col in ["ΔX (m)", "ΔY (m)", "Distancia (m)", "Acumulado (m)", "Azimut (°)"]:
-        df[col] = df[col].astype(float).round(2)
-
-    return df
+    return pd.DataFrame({
+        "Tramo": nombres,
+        "ΔX (m)": dx.round(2),
+        "ΔY (m)": dy.round(2),
+        "Distancia (m)": d.round(2),
+        "Acumulado (m)": np.cumsum(d).round(2),
+        "Azimut (°)": az.round(2),
+    })
 
 
 # =========================
 # Deflexiones por punto
 # =========================
 def calcular_deflexiones(
-    puntos: List[Point],
-    etiquetas: List[str]
+    puntos: np.ndarray | List[Point],
+    etiquetas: np.ndarray | List[str]
 ) -> pd.DataFrame:
     """
-    Calcula deflexión por punto interior (P2..P(n-1)).
+    Calcula deflexión por punto interior (P2..P(n-1)), vectorizado.
 
     Retorna DataFrame con:
     - Punto
     - Deflexión (°)
     """
-    if len(puntos) < 3:
+    xy = _como_xy(puntos)
+    if len(xy) < 3:
         return pd.DataFrame(columns=["Punto", "Deflexión (°)"])
 
-    filas = []
-    for i in range(1, len(puntos) - 1):
-        ang = deflexion_deg(puntos[i - 1], puntos[i], puntos[i + 1])
-        filas.append({
-            "Punto": etiquetas[i],
-            "Deflexión (°)": round(float(ang), 2),
-        })
+    # Azimutes desde cada punto interior p2 hacia p1 y hacia p3
+    # (restas explícitas, no -diff: con tramo nulo -0.0 cambiaría arctan2)
+    p1, p2, p3 = xy[:-2], xy[1:-1], xy[2:]
+    az_in = np.degrees(np.arctan2(p1[:, 1] - p2[:, 1], p1[:, 0] - p2[:, 0])) % 360
+    az_out = np.degrees(np.arctan2(p3[:, 1] - p2[:, 1], p3[:, 0] - p2[:, 0])) % 360
+    diff = np.abs(az_out - az_in)
+    ang = np.where(diff > 180, 360 - diff, diff)
 
-    return pd.DataFrame(filas)
+    return pd.DataFrame({
+        "Punto": np.asarray(etiquetas, dtype=object)[1:-1],
+        "Deflexión (°)": ang.round(2),
+    })
 
 
 # =========================
 # Clasificación estructural
 # =========================
+# Umbrales de deflexión (°) y resultado por tramo: ≤5 Paso, (5,30] Ángulo,
+# (30,60] Doble remate, (60,90] y >90 Giro
+_UMBRALES_ANGULO = np.array([5.0, 30.0, 60.0, 90.0])
+_ESTRUCTURA_POR_TRAMO = np.array(["Paso", "Ángulo", "Doble remate", "Giro", "Giro"], dtype=object)
+_RETENIDAS_POR_TRAMO = np.array([0, 1, 3, 2, 2])
+
+
+def clasificar_por_angulo_array(angulos) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versión vectorizada de clasificar_por_angulo (un solo np.digitize).
+
+    Retorna:
+    - array de tipos de estructura
+    - array de retenidas recomendadas
+    """
+    a = np.asarray(angulos, dtype=float)
+    idx = np.digitize(a, _UMBRALES_ANGULO, right=True)
+    idx[np.isnan(a)] = 0  # NaN no supera ningún umbral -> Paso
+    return _ESTRUCTURA_POR_TRAMO[idx], _RETENIDAS_POR_TRAMO[idx]
+
+
 def clasificar_por_angulo(ang: float) -> tuple[str, int]:
     """
     Clasifica estructura según deflexión.
@@ -165,12 +183,5 @@ def clasificar_por_angulo(ang: float) -> tuple[str, int]:
     - Tipo de estructura
     - Número de retenidas recomendadas
     """
-    if ang > 90:
-        return "Giro", 2
-    if ang > 60:
-        return "Giro", 2
-    if ang > 30:
-        return "Doble remate", 3
-    if ang > 5:
-        return "Ángulo", 1
-    return "Paso", 0
+    est, ret = clasificar_por_angulo_array([ang])
+    return str(est[0]), int(ret[0])
@@ -2,12 +2,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from typing import List, Tuple
+
+import numpy as np
 import pandas as pd
 
 
-def _norm_si_no(v) -> str:
-    s = str(v).strip().upper()
-    return "SI" if s in ("SI", "S", "TRUE", "1") else "NO"
+# Valores (ya en mayúscula) que se interpretan como "SI"; todo lo demás es "NO"
+_VALORES_SI = ("SI", "S", "TRUE", "1")
+
+
+def _norm_si_no_col(col: pd.Series) -> np.ndarray:
+    """Normaliza una columna completa a SI/NO sin llamar Python por celda."""
+    s = col.astype(str).str.strip().str.upper()
+    return np.where(s.isin(_VALORES_SI), "SI", "NO")
 
 
 def _norm_col(c: str) -> str:
@@ -42,7 +50,8 @@ MAPA_COLUMNAS = {
     "ALTITUD(M)": "Altitud",
     "ALTITUD (MSNM)": "Altitud",
     "ALTITUD (m)": "Altitud",
-    
+    "ALTITUDE": "Altitud",
+    "ALTITUDE (M)": "Altitud",
 
     # Poste (opcional)
     "POSTE": "Poste",
@@ -51,46 +60,84 @@ MAPA_COLUMNAS = {
     "ESPACIO RETENIDA": "Espacio Retenida",
     "ESPACIO PARA RETENIDA": "Espacio Retenida",
     "ESPACIO_RETENIDA": "Espacio Retenida",
+
+    # Alturas por punto (opcional, perfil)
+    "ALTURA_POSTE_M": "Altura_Poste_m",
+    "ALTURA_AMARRE_M": "Altura_Amarre_m",
 }
 
+# Columnas canónicas ya resueltas (se adjuntan en df.attrs["colmap"] para que
+# la UI no vuelva a buscarlas)
+COLMAP_ENTRADA = {
+    "x": "X",
+    "y": "Y",
+    "punto": "Punto",
+    "poste": "Poste",
+    "espacio": "Espacio Retenida",
+}
+
+# dtype de lectura por columna interna (evita inferencia y el .astype posterior)
+_DTYPE_LECTURA = {
+    "Punto": str,
+    "X": "float64",
+    "Y": "float64",
+    "Altitud": "float64",
+    "Poste": str,
+    "Espacio Retenida": str,
+    "Altura_Poste_m": "float64",
+    "Altura_Amarre_m": "float64",
+}
+
+
+def _leer_excel(archivo) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Lee la primera hoja con el motor calamine (Rust, mucho más rápido que
+    openpyxl; requiere pandas >= 2.2). Si python-calamine no está instalado,
+    cae a openpyxl.
+
+    Primero lee solo el encabezado y luego parsea únicamente las columnas
+    reconocidas en MAPA_COLUMNAS, con dtype declarado.
+    Devuelve (df con columnas internas, encabezado original).
+    """
+    try:
+        xls = pd.ExcelFile(archivo, engine="calamine")
+    except ImportError:
+        if hasattr(archivo, "seek"):
+            archivo.seek(0)
+        xls = pd.ExcelFile(archivo)
+
+    with xls:
+        encabezado = list(xls.parse(sheet_name=0, nrows=0).columns)
+        destino = {c: MAPA_COLUMNAS.get(_norm_col(c)) for c in encabezado}
+        usecols = [c for c in encabezado if destino[c] is not None]
+        dtype = {c: _DTYPE_LECTURA[destino[c]] for c in usecols if destino[c] in _DTYPE_LECTURA}
+        df = xls.parse(sheet_name=0, usecols=usecols, dtype=dtype)
+
+    return df.rename(columns=destino), encabezado
+
 
 def leer_puntos_excel(archivo) -> pd.DataFrame:
     """
     Lee puntos desde Excel y normaliza columnas a:
       - Punto (obligatoria)
       - X, Y (obligatorias)
-      - Altitude (opcional)
+      - Altitud (opcional)
       - Poste (opcional; si no viene, se crea vacío)
       - Espacio Retenida (opcional; si no viene, se asume SI)
     """
-    df = pd.read_excel(archivo)
-
-    # Normalizar encabezados
-    cols_norm = [_norm_col(c) for c in df.columns]
-    df.columns = cols_norm
-
-    # Renombrar usando el mapa (solo las que existan)
-    rename_dict = {c: MAPA_COLUMNAS[c] for c in df.columns if c in MAPA_COLUMNAS}
-    df = df.rename(columns=rename_dict)
+    # Solo columnas reconocidas, ya renombradas y con tipo declarado
+    df, encabezado = _leer_excel(archivo)
 
     # Validación de obligatorias
     for c in ["Punto", "X", "Y"]:
         if c not in df.columns:
             raise ValueError(
                 f"Falta columna obligatoria '{c}' en el Excel. "
-                f"Columnas detectadas: {list(df.columns)}"
+                f"Columnas detectadas: {encabezado}"
             )
 
-    df = df.copy()
-
-    # Tipos base
+    # Tipos base (X, Y, Altitud ya llegan como float64 desde la lectura)
     df["Punto"] = df["Punto"].astype(str).str.strip()
-    df["X"] = df["X"].astype(float)
-    df["Y"] = df["Y"].astype(float)
-
-    # Altitude opcional
-    if "Altitud (m)" in df.columns:
-        df["Altitud (m)"] = df["Altitud (m)"].astype(float)
 
     # Poste opcional
     if "Poste" not in df.columns:
@@ -100,8 +147,14 @@ def leer_puntos_excel(archivo) -> pd.DataFrame:
 
     # Espacio Retenida opcional (normalizado a SI/NO)
     if "Espacio Retenida" in df.columns:
-        df["Espacio Retenida"] = df["Espacio Retenida"].apply(_norm_si_no)
+        df["Espacio Retenida"] = _norm_si_no_col(df["Espacio Retenida"])
     else:
         df["Espacio Retenida"] = "SI"
 
+    # Pocos valores distintos (PC-40, PM-35, SI/NO...): dtype category
+    df["Poste"] = df["Poste"].astype("category")
+    df["Espacio Retenida"] = df["Espacio Retenida"].astype("category")
+
+    df.attrs["colmap"] = dict(COLMAP_ENTRADA)
+
     return df
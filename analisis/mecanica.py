@@ -2,15 +2,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from functools import lru_cache
+
 from .catalogos import CONDUCTORES_ACSR, RETENIDAS_RECOMENDADAS, CAP_RETENIDA_ULT_LBF
 from analisis.unidades import kgf_to_kN, kg_m_to_kN_m, lbf_to_kN
 
+# Catálogo inmutable: se cachea por (calibre, fraccion_trabajo)
+@lru_cache(maxsize=256)
 def tension_trabajo_kN(calibre: str, fraccion_trabajo: float) -> float:
     if calibre not in CONDUCTORES_ACSR:
         raise ValueError(f"Calibre no válido: {calibre}")
     tr_kgf = CONDUCTORES_ACSR[calibre]["TR_kgf"]
     return kgf_to_kN(tr_kgf) * float(fraccion_trabajo)
 
+@lru_cache(maxsize=256)
 def peso_lineal_kN_m(calibre: str) -> float:
     if calibre not in CONDUCTORES_ACSR:
         raise ValueError(f"Calibre no válido: {calibre}")
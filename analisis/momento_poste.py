@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from typing import Optional
+import numpy as np
 import pandas as pd
 
-from .norma_postes import h_amarre_tipica_m
+from .norma_postes import h_amarre_tipica_m, H_AMARRE_TIPICA_TABLA, DEFAULT_H_AMARRE_M
 
 
 def calcular_momento_poste(
@@ -75,10 +76,19 @@ def calcular_momento_poste(
         h = float(h_amarre_tipica_m(t, default_m=default_h_amarre_m))
         return h if h > 0 else float(default_h_amarre_m)
 
+    # Gather sobre la tabla precalculada; lo que no esté en la tabla se
+    # resuelve una sola vez por valor distinto.
     if col_poste in out.columns:
-        h_tip = out[col_poste].apply(_h_tipica)
+        tipos = out[col_poste].astype(str).str.strip().str.upper()
+        tabla = H_AMARRE_TIPICA_TABLA if float(default_h_amarre_m) == DEFAULT_H_AMARRE_M else {}
+        h_tip = tipos.map(tabla)
+        faltan = h_tip.isna()
+        if faltan.any():
+            extra = {t: _h_tipica(t) for t in tipos[faltan].unique()}
+            h_tip = h_tip.fillna(tipos.map(extra))
+        h_tip = h_tip.astype(float)
     else:
-        h_tip = pd.Series([float(default_h_amarre_m)] * len(out), index=out.index)
+        h_tip = pd.Series(float(default_h_amarre_m), index=out.index)
 
     # Selección final: usar excel si es válida (>0), si no usar típica
     if h_excel is not None:
@@ -89,15 +99,19 @@ def calcular_momento_poste(
     out["M_base (kN·m)"] = out[col_H] * out["h_amarre (m)"]
 
     if incluir_fp:
-        out["He (m)"] = out["h_amarre (m)"] + float(he_offset_m)
-        out["Fp (kN)"] = out["M_base (kN·m)"] / out["He (m)"].replace(0, pd.NA)
+        He = out["h_amarre (m)"].to_numpy(np.float64) + float(he_offset_m)
+        M = out["M_base (kN·m)"].to_numpy(np.float64)
+        Fp = np.full_like(M, np.nan)
+        np.divide(M, He, out=Fp, where=He != 0.0)
+        out["He (m)"] = He
+        out["Fp (kN)"] = Fp
 
     # Redondeos
     out["h_amarre (m)"] = out["h_amarre (m)"].astype(float).round(2)
     out["M_base (kN·m)"] = out["M_base (kN·m)"].astype(float).round(2)
     if incluir_fp:
         out["He (m)"] = out["He (m)"].astype(float).round(2)
-        out["Fp (kN)"] = pd.to_numeric(out["Fp (kN)"], errors="coerce").round(3)
+        out["Fp (kN)"] = out["Fp (kN)"].round(3)
 
     # Orden limpio
     base_cols = [col_punto]
@@ -5,6 +5,8 @@ from __future__ import annotations
 from typing import Dict, Any, Optional
 import re
 
+import pandas as pd
+
 from .catalogos import POSTES_CONCRETO_TABLA_1, POSTES_CLASES_APENDICE
 from .unidades import kgf_to_kN, lbf_to_kN
 
@@ -68,6 +70,15 @@ PUNTOS_AMARRE_DESDE_PUNTA_M: Dict[str, Dict[str, float]] = {
 _IDX_CONCRETO = {str(r["id"]).strip().upper(): r for r in POSTES_CONCRETO_TABLA_1}
 _IDX_CLASES = {int(r["clase"]): r for r in POSTES_CLASES_APENDICE}
 
+# Vista columnar de la tabla de concreto (para consultas masivas)
+_CONCRETO_DF = (
+    pd.DataFrame(POSTES_CONCRETO_TABLA_1)
+    .assign(id=lambda d: d["id"].astype(str).str.strip().str.upper())
+    .set_index("id")
+)
+_LONGITUDES: Dict[str, float] = _CONCRETO_DF["longitud_m"].astype(float).to_dict()
+_ALIAS_IDS: Dict[str, str] = {k.strip().upper(): v.strip().upper() for k, v in ALIAS_POSTES.items()}
+
 
 # ============================================================
 # 4) UTILIDADES INTERNAS
@@ -147,6 +158,16 @@ def altura_poste_m(tipo_poste: str, default_m: float = DEFAULT_ALTURA_POSTE_M) -
     return float(default_m)
 
 
+def alturas_poste_m(tipos, default_m: float = DEFAULT_ALTURA_POSTE_M) -> pd.Series:
+    """
+    Versión masiva de altura_poste_m: un solo gather sobre la tabla de concreto
+    en vez de una llamada a obtener_ficha_poste por fila.
+    """
+    claves = pd.Series(tipos).astype(str).str.strip().str.upper()
+    ids = claves.where(claves.isin(list(_LONGITUDES)), claves.map(_ALIAS_IDS))
+    return ids.map(_LONGITUDES).astype(float).fillna(float(default_m))
+
+
 # ============================================================
 # 7) CAPACIDAD HORIZONTAL (kN)
 # ============================================================
@@ -180,6 +201,18 @@ def h_amarre_tipica_m(
     return float(val if val > 0 else default_m)
 
 
+def h_amarre_tipica_m_serie(
+    tipos,
+    default_m: float = DEFAULT_H_AMARRE_M,
+    offset_desde_punta_m: float = DEFAULT_OFFSET_AMARRE_DESDE_PUNTA_M,
+) -> pd.Series:
+    """
+    h_amarre_tipica_m para muchos postes a la vez (misma regla, vectorizada).
+    """
+    val = alturas_poste_m(tipos, default_m=max(default_m, 1.0)) - float(offset_desde_punta_m)
+    return val.where(val > 0, float(default_m))
+
+
 # ============================================================
 # 9) AMARRE NORMATIVO (por catálogo)
 # ============================================================
@@ -214,3 +247,16 @@ def h_amarre_norma_m(
     off = offset_amarre_desde_punta_m(tipo_poste, uso=uso, default_m=default_offset_m)
     val = float(h_poste) - float(off)
     return float(val if val > 0 else default_h_amarre_m)
+
+
+# ============================================================
+# 10) TABLA PRECALCULADA DE h_amarre TÍPICA
+# ------------------------------------------------------------
+# Clave: tipo normalizado (strip + upper) -> h_amarre_tipica_m(tipo)
+# con los defaults del módulo. Permite resolver una columna completa
+# de postes con un solo .map().
+# ============================================================
+H_AMARRE_TIPICA_TABLA: Dict[str, float] = {
+    k: h_amarre_tipica_m(k)
+    for k in [*ALIAS_POSTES, *_IDX_CONCRETO, *(f"CLASE {c}" for c in _IDX_CLASES)]
+}
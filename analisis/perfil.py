@@ -2,16 +2,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional, Tuple
 import numpy as np
+import pandas as pd
 import math
 
 from .norma_postes import altura_poste_m
-from .geometria import dist_utm
 from .mecanica import peso_lineal_kN_m, tension_trabajo_kN
 
-Point = Tuple[float, float]
-
 # ============================================================
 # Parámetros 
 # ============================================================
@@ -22,6 +20,23 @@ DESPEJE_MIN_M_DEFAULT: float = 0.00                # m (ponlo en 6.0, 7.0 etc si
 # ============================================================
 # Utilidades de alturas
 # ============================================================
+def _col_float(df, name: str) -> np.ndarray:
+    """Columna como ndarray float64, sin copiar si ya es float64."""
+    s = df[name]
+    if s.dtype == np.float64:
+        return s.to_numpy(dtype=np.float64, copy=False)
+    return s.astype(np.float64, copy=False).to_numpy()
+
+
+# Nombres aceptados para la columna de cota del terreno
+_COLS_ALTITUD: Tuple[str, ...] = ("Altitud", "Altitude")
+
+
+def _col_altitud(df) -> Optional[str]:
+    """Nombre de la columna de altitud presente en df (o None)."""
+    return next((c for c in _COLS_ALTITUD if c in df.columns), None)
+
+
 def altura_poste_por_df(df, tipo_poste: str, default_m: float = 12.0) -> np.ndarray:
     """
     Altura del poste (m) por punto.
@@ -29,7 +44,7 @@ def altura_poste_por_df(df, tipo_poste: str, default_m: float = 12.0) -> np.ndar
     - Si no, toma altura del catálogo/norma via altura_poste_m(tipo_poste).
     """
     if "Altura_Poste_m" in df.columns:
-        return df["Altura_Poste_m"].astype(float).to_numpy()
+        return _col_float(df, "Altura_Poste_m")
 
     # altura_poste_m ya resuelve tipo_poste (ej: "PM-40", "PC-12-750", etc.)
     h = float(altura_poste_m(tipo_poste, default_m=default_m))
@@ -49,7 +64,7 @@ def altura_amarre_abs(
     - Si no, amarre = terreno + altura_poste - offset_desde_punta_m
     """
     if "Altura_Amarre_m" in df.columns:
-        return terreno + df["Altura_Amarre_m"].astype(float).to_numpy()
+        return terreno + _col_float(df, "Altura_Amarre_m")
 
     return terreno + h_poste - float(offset_desde_punta_m)
 
@@ -57,6 +72,18 @@ def altura_amarre_abs(
 # ============================================================
 # Sag / perfil
 # ============================================================
+# Debajo de este |x| se usa la serie de Taylor de cosh(x) - 1 (hasta x^6):
+# evita la cancelación de cosh(x) - 1 y la llamada a cosh.
+_X_TAYLOR_MAX: float = 0.1
+
+
+def _cosh_menos_1(x: float) -> float:
+    if abs(x) < _X_TAYLOR_MAX:
+        x2 = x * x
+        return x2 * (0.5 + x2 * (1.0 / 24.0 + x2 / 720.0))
+    return math.cosh(x) - 1.0
+
+
 def sag_parabolica_m(L: float, wv_kN_m: float, H_kN: float) -> float:
     """
     Parabólica (aprox):
@@ -68,6 +95,17 @@ def sag_parabolica_m(L: float, wv_kN_m: float, H_kN: float) -> float:
     return float(wv_kN_m * L * L / (8.0 * H_kN))
 
 
+def sag_parabolica_m_array(L: np.ndarray, wv_kN_m: float, H_kN: float) -> np.ndarray:
+    """
+    Igual que sag_parabolica_m pero para todos los vanos a la vez.
+    Vanos con L <= 0 (o H <= 0) quedan con f = 0.
+    """
+    L = np.asarray(L, dtype=float)
+    if H_kN <= 0:
+        return np.zeros_like(L)
+    return np.where(L > 0, wv_kN_m * L * L / (8.0 * H_kN), 0.0)
+
+
 def sag_catenaria_m(Lh: float, wv_kN_m: float, H_kN: float) -> float:
     """
     Catenaria real (nivelada) por peso vertical (sin viento en vertical):
@@ -82,7 +120,7 @@ def sag_catenaria_m(Lh: float, wv_kN_m: float, H_kN: float) -> float:
     if Lh <= 0 or wv_kN_m <= 0 or H_kN <= 0:
         return 0.0
     x = (wv_kN_m * Lh) / (2.0 * H_kN)
-    return float((H_kN / wv_kN_m) * (math.cosh(x) - 1.0))
+    return float((H_kN / wv_kN_m) * _cosh_menos_1(x))
 
 
 def tension_soporte_catenaria_kN(Lh: float, wv_kN_m: float, H_kN: float) -> float:
@@ -96,7 +134,40 @@ def tension_soporte_catenaria_kN(Lh: float, wv_kN_m: float, H_kN: float) -> floa
     if Lh <= 0 or wv_kN_m <= 0 or H_kN <= 0:
         return 0.0
     x = (wv_kN_m * Lh) / (2.0 * H_kN)
-    return float(H_kN * math.cosh(x))
+    return float(H_kN * (1.0 + _cosh_menos_1(x)))
+
+
+def sag_tension_catenaria_array(
+    Lh: np.ndarray,
+    wv_kN_m: float,
+    H_kN: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flecha (m) y tensión en soporte (kN) de la catenaria nivelada para todos
+    los vanos a la vez, con un solo cosh:
+
+        cx = cosh( (wv*Lh)/(2H) )
+        f  = (H/wv) * (cx - 1)
+        Ts = H * cx
+
+    cosh se evalúa en un solo llamado de NumPy sobre los vanos con |x| grande;
+    el resto usa la misma serie de Taylor que _cosh_menos_1.
+    Vanos con Lh <= 0 (o wv/H <= 0) quedan en 0.
+    """
+    Lh = np.asarray(Lh, dtype=float)
+    if wv_kN_m <= 0 or H_kN <= 0:
+        return np.zeros_like(Lh), np.zeros_like(Lh)
+
+    x = (wv_kN_m / (2.0 * H_kN)) * Lh
+    x2 = x * x
+    cm1 = x2 * (0.5 + x2 * (1.0 / 24.0 + x2 / 720.0))
+    grande = np.abs(x) >= _X_TAYLOR_MAX
+    if grande.any():
+        cm1[grande] = np.cosh(x[grande]) - 1.0
+
+    f = np.where(Lh > 0, (H_kN / wv_kN_m) * cm1, 0.0)
+    Ts = np.where(Lh > 0, H_kN * (1.0 + cm1), 0.0)
+    return f, Ts
 
 
 def evaluar_despeje_por_vano(
@@ -138,6 +209,75 @@ def evaluar_despeje_por_vano(
     return chain0 + s, terr, cond, float(np.min(despeje))
 
 
+def _perfil_vanos(
+    chain0: np.ndarray,
+    L: np.ndarray,
+    g0: np.ndarray,
+    g1: np.ndarray,
+    y0: np.ndarray,
+    y1: np.ndarray,
+    sag_f: np.ndarray,
+    r: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mismo modelo que evaluar_despeje_por_vano, pero para todos los vanos a la
+    vez: mallas (n_vanos, npts) por productos externos, sin bucle por vano.
+    Un vano de longitud cero se reduce a su punto inicial repetido.
+    Devuelve (X, G, Y, despeje mínimo por vano).
+    """
+    R = np.where((L > 0)[:, None], r, 0.0)
+
+    # Operaciones in-place (out=): una sola reserva por malla + un buffer de
+    # trabajo, en vez de un temporal (n_vanos, npts) por cada operación.
+    X = np.multiply(L[:, None], R)
+    X += chain0[:, None]
+
+    G = np.multiply((g1 - g0)[:, None], R)
+    G += g0[:, None]
+
+    # cond = y_line - 4*f*r*(1-r)
+    Y = np.multiply((y1 - y0)[:, None], R)
+    Y += y0[:, None]
+
+    tmp = np.subtract(1.0, R)
+    tmp *= R
+    tmp *= (4.0 * sag_f)[:, None]
+    Y -= tmp
+
+    np.subtract(Y, G, out=tmp)
+    return X, G, Y, tmp.min(axis=1, initial=np.inf)
+
+
+def _armar_tabla_vanos(
+    etiquetas: List[str],
+    L: np.ndarray,
+    f: np.ndarray,
+    Ts: np.ndarray,
+    min_clear: np.ndarray,
+    *,
+    modo: str,
+    wv: float,
+    H: float,
+    despeje_min_m: float,
+) -> pd.DataFrame:
+    """
+    Tabla de vanos armada por columnas, en precisión completa
+    (el redondeo se aplica solo al mostrar).
+    """
+    tramos = [f"{a} → {b}" for a, b in zip(etiquetas[:-1], etiquetas[1:])]
+    return pd.DataFrame({
+        "Tramo": tramos,
+        "Longitud (m)": L,
+        "Modo sag": modo,
+        "wv (kN/m)": wv,
+        "H (kN)": H,
+        "Ts (kN)": Ts,
+        "Sag f (m)": f,
+        "Despeje mín (m)": min_clear,
+        "Cumple despeje": np.where(min_clear >= float(despeje_min_m), "SI", "NO"),
+    }, copy=False)
+
+
 # ============================================================
 # Motor de perfil
 # ============================================================
@@ -150,29 +290,64 @@ def analizar_perfil(
     modo_sag: str = "CATENARIA",  # "CATENARIA" | "PARABOLA"
     offset_amarre_desde_punta_m: float = OFFSET_AMARRE_DESDE_PUNTA_M_DEFAULT,
     despeje_min_m: float = DESPEJE_MIN_M_DEFAULT,
+    profile_dtype=np.float32,
 ) -> Optional[Dict]:
     """
-    Analiza perfil longitudinal si existe columna 'Altitude'.
+    Analiza perfil longitudinal si existe columna 'Altitud' (o 'Altitude').
 
     - wv: solo peso (vertical) por conductor (NO multiplicar por fases)
     - H: tensión horizontal por fase (aquí se usa tensión de trabajo)
+    - profile_dtype: dtype de las mallas X_prof/G_prof/Y_prof (solo para graficar).
+      Los cálculos mecánicos y el despeje siempre se hacen en float64;
+      usar np.float64 si se necesitan las mallas con precisión completa.
 
     Nota: el viento se usa en planta (esfuerzos laterales), no en la flecha vertical.
     """
-    if "Altitud" not in df.columns:
+    col_alt = _col_altitud(df)
+    if col_alt is None:
         return None
 
-    puntos: List[Point] = list(zip(df["X"].tolist(), df["Y"].tolist()))
+    modo = str(modo_sag).strip().upper()
+    meta = {
+        "tipo_poste": str(tipo_poste),
+        "calibre": str(calibre),
+        "fraccion_trabajo": float(fraccion_trabajo),
+        "modo_sag": modo,
+        "offset_amarre_desde_punta_m": float(offset_amarre_desde_punta_m),
+        "despeje_min_m": float(despeje_min_m),
+    }
+
+    # Sin vanos (0 o 1 punto): resultado vacío sin pasar por el motor
+    n = len(df)
+    if n < 2:
+        vacio = np.empty(0, dtype=profile_dtype)
+        terreno = _col_float(df, col_alt)
+        return {
+            "total_m": 0.0,
+            "chain_nodes": np.zeros(n),
+            "terreno": terreno,
+            "amarre": altura_amarre_abs(
+                df, terreno, altura_poste_por_df(df, tipo_poste),
+                offset_desde_punta_m=offset_amarre_desde_punta_m,
+            ),
+            "X_prof": vacio,
+            "G_prof": vacio,
+            "Y_prof": vacio,
+            "tabla_vanos": pd.DataFrame(),
+            "meta": meta,
+        }
+
+    X = df["X"].to_numpy(dtype=np.float64)
+    Y = df["Y"].to_numpy(dtype=np.float64)
     etiquetas = df["Punto"].tolist()
 
-    # chainage (distancia acumulada por tramos)
-    chain_nodes = [0.0]
-    for i in range(len(puntos) - 1):
-        d = float(dist_utm(puntos[i], puntos[i + 1]))
-        chain_nodes.append(chain_nodes[-1] + d)
-    chain_nodes = np.array(chain_nodes, dtype=float)
+    # longitudes por vano y chainage (distancia acumulada por tramos)
+    L_all = np.hypot(np.diff(X), np.diff(Y))  # m (usamos L≈Lh en FASE 2 puedes meter proyección)
+    chain_nodes = np.empty(len(X))
+    chain_nodes[0] = 0.0
+    np.cumsum(L_all, out=chain_nodes[1:])
 
-    terreno = df["Altitud"].astype(float).to_numpy()
+    terreno = _col_float(df, col_alt)
     h_poste = altura_poste_por_df(df, tipo_poste)
     amarre = altura_amarre_abs(df, terreno, h_poste, offset_desde_punta_m=offset_amarre_desde_punta_m)
 
@@ -180,65 +355,38 @@ def analizar_perfil(
     wv = float(peso_lineal_kN_m(calibre))                     # kN/m (peso)
     H = float(tension_trabajo_kN(calibre, fraccion_trabajo))  # kN (tensión horizontal aprox)
 
-    modo = str(modo_sag).strip().upper()
-
-    filas_vanos: List[Dict] = []
-    X_prof, G_prof, Y_prof = [], [], []
-
-    for i in range(len(puntos) - 1):
-        L = float(dist_utm(puntos[i], puntos[i + 1]))  # m (usamos L≈Lh en FASE 2 puedes meter proyección)
-        Lh = L
-
-        if modo == "CATENARIA":
-            f = sag_catenaria_m(Lh, wv, H)
-            Ts = tension_soporte_catenaria_kN(Lh, wv, H)
-        else:
-            f = sag_parabolica_m(L, wv, H)
-            Ts = H  # referencia
-
-        ch0 = float(chain_nodes[i])
-        g0, g1 = float(terreno[i]), float(terreno[i + 1])
-        y0, y1 = float(amarre[i]), float(amarre[i + 1])
-
-        ch, g, y, min_clear = evaluar_despeje_por_vano(
-            chain0=ch0, L=L,
-            g0=g0, g1=g1,
-            y0=y0, y1=y1,
-            sag_f=f,
-            npts=90,
-        )
-
-        X_prof.append(ch)
-        G_prof.append(g)
-        Y_prof.append(y)
-
-        filas_vanos.append({
-            "Tramo": f"{etiquetas[i]} → {etiquetas[i + 1]}",
-            "Longitud (m)": round(L, 2),
-            "Modo sag": modo,
-            "wv (kN/m)": round(wv, 5),
-            "H (kN)": round(H, 3),
-            "Ts (kN)": round(float(Ts), 3),
-            "Sag f (m)": round(float(f), 3),
-            "Despeje mín (m)": round(float(min_clear), 3),
-            "Cumple despeje": "SI" if (min_clear >= float(despeje_min_m)) else "NO",
-        })
+    n_vanos = len(L_all)
+
+    # Flecha y tensión en soporte para todos los vanos a la vez
+    if modo == "CATENARIA":
+        f_all, Ts_all = sag_tension_catenaria_array(L_all, wv, H)
+    else:
+        f_all = sag_parabolica_m_array(L_all, wv, H)
+        Ts_all = np.full(n_vanos, H, dtype=float)  # referencia
+
+    # Perfil de todos los vanos en float64; solo la malla para graficar usa profile_dtype
+    npts = 90
+    r = np.linspace(0.0, 1.0, npts)
+    X_prof, G_prof, Y_prof, min_clear_all = _perfil_vanos(
+        chain_nodes[:-1], L_all,
+        terreno[:-1], terreno[1:],
+        amarre[:-1], amarre[1:],
+        f_all, r,
+    )
+
+    df_vanos = _armar_tabla_vanos(
+        etiquetas, L_all, f_all, Ts_all, min_clear_all,
+        modo=modo, wv=wv, H=H, despeje_min_m=despeje_min_m,
+    )
 
     return {
         "total_m": float(chain_nodes[-1]) if len(chain_nodes) else 0.0,
         "chain_nodes": chain_nodes,
         "terreno": terreno,
         "amarre": amarre,
-        "X_prof": np.concatenate(X_prof) if X_prof else np.array([], dtype=float),
-        "G_prof": np.concatenate(G_prof) if G_prof else np.array([], dtype=float),
-        "Y_prof": np.concatenate(Y_prof) if Y_prof else np.array([], dtype=float),
-        "tabla_vanos": filas_vanos,
-        "meta": {
-            "tipo_poste": str(tipo_poste),
-            "calibre": str(calibre),
-            "fraccion_trabajo": float(fraccion_trabajo),
-            "modo_sag": modo,
-            "offset_amarre_desde_punta_m": float(offset_amarre_desde_punta_m),
-            "despeje_min_m": float(despeje_min_m),
-        }
+        "X_prof": X_prof.astype(profile_dtype, copy=False).ravel(),
+        "G_prof": G_prof.astype(profile_dtype, copy=False).ravel(),
+        "Y_prof": Y_prof.astype(profile_dtype, copy=False).ravel(),
+        "tabla_vanos": df_vanos,
+        "meta": meta,
     }
@@ -11,9 +11,24 @@ from matplotlib.backends.backend_pdf import PdfPages
 
 from .geometria import dist_utm, azimut_deg, deflexion_deg, distancias_tramos
 from .catalogos import FRACCION_TRABAJO_DEFAULT, ANG_RETENIDA_DEFAULT_DEG
+from .formatos import FMT_TABLA_VANOS, FMT_TABLA_RETENIDAS
 
 Point = Tuple[float, float]
 
+# Decimales por columna, los mismos que usa la UI
+_FMT_CELDAS: Dict[str, str] = {**FMT_TABLA_VANOS, **FMT_TABLA_RETENIDAS}
+
+
+def _fmt_celda(col: str, v):
+    """
+    Redondeo solo al renderizar (los datos llegan en precisión completa),
+    con el formato de la columna; sin formato definido, el valor tal cual.
+    """
+    fmt = _FMT_CELDAS.get(col)
+    if fmt is not None and isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool):
+        return fmt.format(v)
+    return v
+
 def _tabla_ax(ax, rows: List[Dict], titulo: str, fontsize=9, scale=(1.02, 1.4)):
     ax.axis("off")
     ax.set_title(titulo, fontsize=13, fontweight="bold", pad=10)
@@ -22,7 +37,7 @@ def _tabla_ax(ax, rows: List[Dict], titulo: str, fontsize=9, scale=(1.02, 1.4)):
         return
 
     cols = list(rows[0].keys())
-    cell_text = [list(r.values()) for r in rows]
+    cell_text = [[_fmt_celda(c, v) for c, v in r.items()] for r in rows]
 
     tbl = ax.table(
         cellText=cell_text,
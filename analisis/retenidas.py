@@ -16,8 +16,10 @@ Puede calcular "solo donde aplica" si se le pasa un filtro.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 import math
+import numpy as np
 import pandas as pd
 
 from .mecanica import capacidad_retenida_admisible_kN
@@ -38,8 +40,15 @@ class ParamsRetenida:
 # Funciones base (cortas)
 # =============================================================================
 
-def _cos_safe(phi_rad: float) -> float:
-    c = math.cos(phi_rad)
+@lru_cache(maxsize=16)
+def _sincos(ang_retenida_deg: float) -> Tuple[float, float]:
+    """(sin(phi), cos(phi)); el ángulo suele ser el mismo en todo el proyecto."""
+    phi = math.radians(ang_retenida_deg)
+    return math.sin(phi), math.cos(phi)
+
+
+def _cos_safe(ang_retenida_deg: float) -> float:
+    c = _sincos(float(ang_retenida_deg))[1]
     if c <= 1e-9:
         raise ValueError("Ángulo de retenida inválido (cos(phi) <= 0).")
     return c
@@ -50,8 +59,7 @@ def tension_retenida_kN(H_kN: float, ang_retenida_deg: float) -> float:
     T = H / cos(phi)
     """
     H = float(H_kN or 0.0)
-    phi = math.radians(float(ang_retenida_deg))
-    return float(H / _cos_safe(phi))
+    return float(H / _cos_safe(ang_retenida_deg))
 
 
 def componente_vertical_retenida_kN(T_kN: float, ang_retenida_deg: float) -> float:
@@ -59,8 +67,8 @@ def componente_vertical_retenida_kN(T_kN: float, ang_retenida_deg: float) -> flo
     V = T * sin(phi)
     """
     T = float(T_kN or 0.0)
-    phi = math.radians(float(ang_retenida_deg))
-    return float(T * math.sin(phi))
+    s, _ = _sincos(float(ang_retenida_deg))
+    return float(T * s)
 
 
 def componente_horizontal_retenida_kN(T_kN: float, ang_retenida_deg: float) -> float:
@@ -68,8 +76,8 @@ def componente_horizontal_retenida_kN(T_kN: float, ang_retenida_deg: float) -> f
     H_ret = T * cos(phi)
     """
     T = float(T_kN or 0.0)
-    phi = math.radians(float(ang_retenida_deg))
-    return float(T * math.cos(phi))
+    _, c = _sincos(float(ang_retenida_deg))
+    return float(T * c)
 
 
 def capacidad_admisible_retenida_kN(params: ParamsRetenida) -> float:
@@ -119,81 +127,56 @@ def calcular_retenidas(
     if df is None or df.empty:
         return pd.DataFrame()
 
-    out = df.copy()
-
     for c in (col_punto, col_H):
-        if c not in out.columns:
+        if c not in df.columns:
             raise ValueError(f"Falta columna requerida: '{c}'.")
 
-    # ¿Dónde aplica?
+    # ¿Dónde aplica? (máscara booleana ndarray, sin acceso por etiqueta)
     if aplicar_si_col is None:
-        aplica = pd.Series([True] * len(out), index=out.index)
+        aplica = np.ones(len(df), dtype=bool)
     else:
-        if aplicar_si_col not in out.columns:
+        if aplicar_si_col not in df.columns:
             raise ValueError(f"aplicar_si_col='{aplicar_si_col}' no existe en df.")
         if aplicar_si_val is None:
             # interpreta como booleano
-            aplica = out[aplicar_si_col].astype(bool)
+            aplica = df[aplicar_si_col].astype(bool).to_numpy()
         else:
-            aplica = out[aplicar_si_col].astype(str).str.upper().eq(str(aplicar_si_val).upper())
+            aplica = (
+                df[aplicar_si_col].astype(str).str.upper()
+                .eq(str(aplicar_si_val).upper()).to_numpy(dtype=bool)
+            )
 
     # Capacidad admisible (constante para el caso)
     T_adm = capacidad_admisible_retenida_kN(params)
 
-    # Inicializar columnas
-    out["H_sin_retenida (kN)"] = out[col_H].astype(float).fillna(0.0)
-
-    T_list, Hret_list, V_list, Hcon_list = [], [], [], []
-    util_list, cumple_list = [], []
-
-    for idx, r in out.iterrows():
-        H = float(r["H_sin_retenida (kN)"] or 0.0)
-
-        if bool(aplica.loc[idx]) and H > 0:
-            T = tension_retenida_kN(H, params.ang_retenida_deg)
-            Hret = componente_horizontal_retenida_kN(T, params.ang_retenida_deg)  # ≈ H
-            V = componente_vertical_retenida_kN(T, params.ang_retenida_deg)
-            Hcon = max(H - Hret, 0.0)  # idealizado (equilibrio perfecto)
-            util = 100.0 * (T / T_adm) if T_adm > 0 else 0.0
-            cumple = "SI" if (T <= T_adm) else "NO"
-        else:
-            T, Hret, V, Hcon = 0.0, 0.0, 0.0, H
-            util, cumple = 0.0, "-"
-
-        T_list.append(T)
-        Hret_list.append(Hret)
-        V_list.append(V)
-        Hcon_list.append(Hcon)
-        util_list.append(util)
-        cumple_list.append(cumple)
-
-    out["T_retenida (kN)"] = [round(x, 4) for x in T_list]
-    out["H_aporte_ret (kN)"] = [round(x, 4) for x in Hret_list]
-    out["V_retenida (kN)"] = [round(x, 4) for x in V_list]
-    out["H_poste_con_ret (kN)"] = [round(x, 4) for x in Hcon_list]
-
-    out["T_admisible_retenida (kN)"] = round(float(T_adm), 4)
-    out["Utilización retenida (%)"] = [round(x, 1) for x in util_list]
-    out["Cumple retenida"] = cumple_list
-
-    out["Ángulo retenida (°)"] = float(params.ang_retenida_deg)
-    out["FS retenida"] = float(params.FS_retenida)
-    out["Cable retenida"] = str(params.cable_retenida)
-
-    # Orden amigable
-    cols_order = [c for c in [
-        col_punto,
-        "H_sin_retenida (kN)",
-        "T_retenida (kN)",
-        "H_aporte_ret (kN)",
-        "V_retenida (kN)",
-        "H_poste_con_ret (kN)",
-        "T_admisible_retenida (kN)",
-        "Utilización retenida (%)",
-        "Cumple retenida",
-        "Ángulo retenida (°)",
-        "FS retenida",
-        "Cable retenida",
-    ] if c in out.columns]
-
-    return out[cols_order] if cols_order else out
+    # Cálculo vectorizado sobre toda la columna H
+    H = df[col_H].astype(float).fillna(0.0).to_numpy(dtype=float)
+    mask = aplica & (H > 0)
+
+    sin_p, cos_p = _sincos(float(params.ang_retenida_deg))
+    if mask.any():
+        cos_p = _cos_safe(params.ang_retenida_deg)
+
+    T = np.where(mask, H / cos_p, 0.0)
+    Hret = T * cos_p                                       # ≈ H
+    V = T * sin_p
+    Hcon = np.where(mask, np.maximum(H - Hret, 0.0), H)    # idealizado (equilibrio perfecto)
+    util = 100.0 * T / T_adm if T_adm > 0 else np.zeros_like(T)
+    cumple = np.where(mask, np.where(T <= T_adm, "SI", "NO"), "-")
+
+    # Resultado armado por columnas (sin copiar df), ya en orden amigable.
+    # Precisión completa; el redondeo se aplica solo al mostrar (UI / PDF)
+    return pd.DataFrame({
+        col_punto: df[col_punto].to_numpy(),
+        "H_sin_retenida (kN)": H,
+        "T_retenida (kN)": T,
+        "H_aporte_ret (kN)": Hret,
+        "V_retenida (kN)": V,
+        "H_poste_con_ret (kN)": Hcon,
+        "T_admisible_retenida (kN)": float(T_adm),
+        "Utilización retenida (%)": util,
+        "Cumple retenida": cumple,
+        "Ángulo retenida (°)": float(params.ang_retenida_deg),
+        "FS retenida": float(params.FS_retenida),
+        "Cable retenida": str(params.cable_retenida),
+    }, index=df.index)
@@ -0,0 +1,765 @@
+# analisis/ui.py
+# -*- coding: utf-8 -*-
+"""
+Interfaz Streamlit (páginas, pestañas y gráficos).
+app.py solo lanza main(); las funciones cacheadas viven aquí para que su
+identidad (y su caché) sea única.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+from datetime import date
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from .io_excel import leer_puntos_excel
+from .catalogos import CONDUCTORES_ACSR, ALTURA_POSTE_DIBUJO_M
+from .formatos import FMT_TABLA_VANOS, FMT_TABLA_RETENIDAS
+from .engine import ejecutar_todo
+
+
+# ============================================================
+# Config / UI helpers
+# ============================================================
+def configurar_pagina() -> None:
+    st.set_page_config(page_title="Análisis Mecánico", layout="wide")
+    st.title("Análisis Mecánico (FASE 1) — Geometría + Cargas + Fuerzas por poste")
+
+
+# Opciones de conductor y su diámetro (el catálogo no cambia en tiempo de
+# ejecución: se arman una vez al importar, no en cada rerun)
+_CALIBRES: Tuple[str, ...] = tuple(CONDUCTORES_ACSR.keys())
+_DIAMETRO_M: Dict[str, float] = {c: float(d["diametro_m"]) for c, d in CONDUCTORES_ACSR.items()}
+
+
+def ui_datos_proyecto() -> Dict[str, Any]:
+    """
+    Datos y parámetros en un formulario de la barra lateral: editar un campo
+    no relanza el cálculo; solo "Aplicar" lo hace. El último proyecto aplicado
+    queda en st.session_state["proyecto"].
+    """
+    form = st.sidebar.form("proyecto_form")
+    form.header("Datos del proyecto")
+
+    nombre = form.text_input("Nombre del proyecto", value="Proyecto prueba")
+    lugar = form.text_input("Lugar / Municipio", value="Honduras")
+    cliente = form.text_input("Cliente (opcional)", value="")
+    responsable = form.text_input("Responsable (opcional)", value="")
+    fecha = form.date_input("Fecha", value=date.today())
+
+    form.divider()
+    form.header("Parámetros de cálculo")
+
+    calibre = form.selectbox("Conductor", _CALIBRES, index=min(2, max(len(_CALIBRES) - 1, 0)))
+    n_fases = form.selectbox("Fases", [1, 2, 3], index=2)
+
+    v_viento_ms = form.number_input("Velocidad viento (m/s)", min_value=0.0, value=0.0, step=0.5)
+    az_viento_deg = form.number_input(
+        "Dirección viento (°)", min_value=0.0, max_value=360.0, value=0.0, step=1.0
+    )
+
+    Cd = form.number_input("Cd", min_value=0.1, value=1.2, step=0.1)
+    rho = form.number_input("ρ aire (kg/m³)", min_value=0.5, value=1.225, step=0.01)
+
+    form.caption("Nota: 0°=Este, 90°=Norte. Dirección del viento en grados.")
+    aplicar = form.form_submit_button("Aplicar")
+
+    if aplicar or "proyecto" not in st.session_state:
+        st.session_state["proyecto"] = {
+            "nombre": nombre,
+            "lugar": lugar,
+            "cliente": cliente,
+            "responsable": responsable,
+            "fecha": str(fecha),
+            "calibre": str(calibre),
+            "n_fases": int(n_fases),
+            "v_viento_ms": float(v_viento_ms),
+            "az_viento_deg": float(az_viento_deg),
+            "diametro_m": float(_DIAMETRO_M[calibre]),
+            "Cd": float(Cd),
+            "rho": float(rho),
+        }
+
+    # Fuera del form: muestra el calibre aplicado, no el que se está editando
+    proyecto = st.session_state["proyecto"]
+    st.sidebar.caption(
+        f"Diámetro aplicado ({proyecto['calibre']}): {proyecto['diametro_m'] * 1000:.2f} mm"
+    )
+    return proyecto
+
+
+def mostrar_resumen_proyecto(proyecto: Dict[str, Any]) -> None:
+    st.info(
+        f"**Proyecto:** {proyecto['nombre']}  |  **Lugar:** {proyecto['lugar']}  |  "
+        f"**Conductor:** {proyecto['calibre']}  |  **Fases:** {proyecto['n_fases']}  |  "
+        f"**Viento:** {proyecto['v_viento_ms']} m/s a {proyecto['az_viento_deg']}°"
+    )
+
+
+def ui_cargar_excel() -> Optional[Any]:
+    """Devuelve el objeto 'archivo' de Streamlit o None si no hay archivo."""
+    st.subheader("Entrada")
+    archivo = st.file_uploader("📄 Sube tu Excel (.xlsx)", type=["xlsx"])
+    if not archivo:
+        st.info("Sube un Excel con columnas: Punto, X, Y (opcional: Altitud, Poste, Espacio Retenida).")
+        return None
+    return archivo
+
+
+# ============================================================
+# Cálculo
+# ============================================================
+# Claves de `proyecto` que afectan el cálculo (el resto son solo rótulos:
+# cambiar nombre/lugar/fecha no invalida la caché).
+_CLAVES_CALCULO = ("calibre", "n_fases", "v_viento_ms", "az_viento_deg", "diametro_m", "Cd", "rho")
+
+
+def _firma_archivo(file_bytes: bytes) -> bytes:
+    """Firma corta del contenido del archivo (clave de caché)."""
+    return hashlib.blake2b(file_bytes, digest_size=16).digest()
+
+
+def _bytes_en_sesion(archivo) -> Tuple[bytes, bytes]:
+    """
+    Bytes y firma del archivo subido, guardados en st.session_state por
+    file_id: se copian del buffer y se hashean una sola vez por subida, no en
+    cada rerun.
+    """
+    file_id = getattr(archivo, "file_id", None)
+    if file_id is None or st.session_state.get("xlsx_id") != file_id:
+        file_bytes = archivo.getvalue()
+        st.session_state["xlsx_bytes"] = file_bytes
+        st.session_state["xlsx_sig"] = _firma_archivo(file_bytes)
+        st.session_state["xlsx_id"] = file_id
+    return st.session_state["xlsx_bytes"], st.session_state["xlsx_sig"]
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_leer(file_sig: bytes, _file_bytes: bytes) -> pd.DataFrame:
+    """
+    Lectura del Excel cacheada por firma del contenido. Los bytes van con
+    prefijo "_" para que Streamlit no los vuelva a hashear.
+    """
+    return leer_puntos_excel(io.BytesIO(_file_bytes))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_calculo(
+    file_sig: bytes, params: Tuple[Tuple[str, Any], ...], _df: pd.DataFrame
+) -> Dict[str, Any]:
+    """
+    Motor completo cacheado por (firma del archivo, parámetros de cálculo).
+    El df sale del mismo archivo, así que no se hashea de nuevo.
+    """
+    return ejecutar_todo(_df, **dict(params))
+
+
+# Columnas que usa el motor; el resto no viaja al cálculo
+_COLUMNAS_MOTOR = (
+    "Punto", "X", "Y", "Altitud", "Altitude", "Poste", "Espacio Retenida",
+    "Altura_Poste_m", "Altura_Amarre_m",
+)
+
+
+def ejecutar_calculo(df: pd.DataFrame, proyecto: Dict[str, Any], file_sig: bytes) -> Dict[str, Any]:
+    necesarias = [c for c in _COLUMNAS_MOTOR if c in df.columns]
+    if len(necesarias) < len(df.columns):
+        df = df[necesarias]
+    params = tuple((k, proyecto[k]) for k in _CLAVES_CALCULO)
+    return _cached_calculo(file_sig, params, df)
+
+
+# ============================================================
+# Render de resultados
+# ============================================================
+# Deflexión es float (NaN en remates); en pantalla los remates llevan "-"
+_FMT_TABLA_DEFLEXION = {
+    "Deflexión (°)": "{:.1f}",
+}
+
+
+def _formatear(df: pd.DataFrame, fmt: Dict[str, str], na_rep: Optional[str] = None):
+    """Styler con formato solo para las columnas presentes."""
+    return df.style.format({c: f for c, f in fmt.items() if c in df.columns}, na_rep=na_rep)
+
+
+def _format_tabla_vanos(df: pd.DataFrame):
+    return _formatear(df, FMT_TABLA_VANOS)
+
+
+def _format_tabla_retenidas(df: pd.DataFrame):
+    return _formatear(df, FMT_TABLA_RETENIDAS)
+
+
+def _mapa_columnas(df: pd.DataFrame) -> Dict[str, Any]:
+    """Nombre de columna sin espacios -> nombre real (búsquedas sin copiar df)."""
+    return {str(c).strip(): c for c in df.columns}
+
+
+def _pick_col(colmap: Dict[str, Any], cands) -> Optional[Any]:
+    """Primera columna candidata presente (devuelve el nombre real)."""
+    return next((colmap[c] for c in cands if c in colmap), None)
+
+
+# Candidatos por columna canónica de entrada (si el df no trae attrs["colmap"])
+_CANDIDATOS_ENTRADA = {
+    "x": ["X (m)", "X", "x", "X_m"],
+    "y": ["Y (m)", "Y", "y", "Y_m"],
+    "punto": ["Punto", "PUNTO"],
+    "poste": ["Poste", "POSTE"],
+    "espacio": ["Espacio Retenida", "ESPACIO RETENIDA", "EspacioRetenida"],
+}
+
+
+def _columnas_entrada(df: pd.DataFrame) -> Dict[str, Optional[Any]]:
+    """
+    Columnas canónicas del Excel de entrada. leer_puntos_excel ya las deja
+    resueltas en df.attrs["colmap"]; si el df no viene de ahí, se buscan una vez.
+    """
+    colmap = df.attrs.get("colmap")
+    if colmap is None:
+        nombres = _mapa_columnas(df)
+        colmap = {k: _pick_col(nombres, cands) for k, cands in _CANDIDATOS_ENTRADA.items()}
+    return colmap
+
+
+# Filas que se envían al navegador por tabla; el resto va en el CSV
+_MAX_FILAS_TABLA = 500
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _csv_tabla(df: pd.DataFrame) -> bytes:
+    """CSV completo de una tabla (utf-8 con BOM para que Excel respete acentos)."""
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def _vista_tabla(df: pd.DataFrame):
+    """Deflexión con "-" en remates; el resto de columnas sin Styler."""
+    if "Deflexión (°)" in df.columns:
+        return _formatear(df, _FMT_TABLA_DEFLEXION, na_rep="-")
+    return df
+
+
+def _tabla(df: pd.DataFrame, title: str) -> None:
+    st.subheader(title)
+    if len(df) <= _MAX_FILAS_TABLA:
+        st.dataframe(_vista_tabla(df), use_container_width=True)
+        return
+
+    # Rutas largas: vista previa + descarga, en vez de serializar todo en cada rerun
+    st.caption(f"Mostrando {_MAX_FILAS_TABLA} de {len(df)} filas.")
+    st.dataframe(_vista_tabla(df.head(_MAX_FILAS_TABLA)), use_container_width=True)
+    nombre = title.split(" (")[0].strip().lower().replace(" ", "_")
+    st.download_button(
+        "Descargar CSV completo",
+        data=_csv_tabla(df),
+        file_name=f"{nombre}.csv",
+        mime="text/csv",
+        key=f"csv_{nombre}",
+    )
+
+
+@st.fragment
+def _render_tab_entrada(df: pd.DataFrame) -> None:
+    _tabla(df, "Entrada")
+
+
+# Normalización SI/NO de 'Espacio Retenida' para la vista superior
+# (valores no reconocidos se conservan tal cual)
+_SI_NO_VISTA = {
+    "SI": "SI", "SÍ": "SI", "1": "SI", "TRUE": "SI", "YES": "SI",
+    "NO": "NO", "0": "NO", "FALSE": "NO", "N": "NO",
+}
+
+
+def _dibujar_vista_superior(
+    ax,
+    x: np.ndarray,
+    y: np.ndarray,
+    puntos: Tuple[str, ...],
+    x0: np.ndarray,
+    y0: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    L: float,
+) -> None:
+    """Dibuja trayectoria, rótulos y flechas de retenida sobre `ax` (ya limpio)."""
+    ax.plot(x, y, linewidth=2, label="Trayectoria")
+    ax.scatter(x, y, zorder=3)
+
+    for i in range(len(x)):
+        ax.text(x[i], y[i], f" {puntos[i]}", fontsize=8, va="bottom")
+
+    if x0.size:
+        ax.quiver(
+            x0, y0, dx, dy,
+            angles="xy", scale_units="xy", scale=1 / L,
+            width=0.003, headwidth=6, headlength=7, headaxislength=6,
+            alpha=0.9
+        )
+
+    ax.set_xlabel("Coordenada X")
+    ax.set_ylabel("Coordenada Y")
+    ax.set_title("Trayectoria y retenidas (vista superior)")
+    ax.grid(True, linestyle="--", alpha=0.35)
+    ax.axis("equal")
+    ax.legend()
+
+
+def _vista_superior_en_sesion(
+    x: np.ndarray,
+    y: np.ndarray,
+    puntos: Tuple[str, ...],
+    x0: np.ndarray,
+    y0: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    L: float,
+) -> Figure:
+    """
+    Figura de la vista superior persistente en st.session_state (una por
+    sesión, no compartida entre sesiones). Se crea una vez; en cada rerun del
+    fragmento se limpia con ax.clear() y se redibuja solo si cambian los datos.
+    """
+    clave = (
+        L,
+        puntos,
+        _firma_archivo(b"".join(a.tobytes() for a in (x, y, x0, y0, dx, dy))),
+    )
+
+    fig = st.session_state.get("_vista_fig")
+    if fig is None:
+        # Figure directa (sin pyplot): no queda registrada en el gestor global
+        fig = Figure(figsize=(8, 6))
+        fig.subplots()
+        st.session_state["_vista_fig"] = fig
+    elif st.session_state.get("_vista_clave") == clave:
+        return fig
+
+    ax = fig.axes[0]
+    ax.clear()
+    _dibujar_vista_superior(ax, x, y, puntos, x0, y0, dx, dy, L)
+    st.session_state["_vista_clave"] = clave
+    return fig
+
+
+@st.fragment
+def _render_tab_resumen(res: Dict[str, Any], df_entrada: pd.DataFrame) -> None:
+    _tabla(res["resumen"], "Resumen por punto (estructura / retenidas)")
+
+    st.divider()
+    st.subheader("Vista superior — Trayectoria y retenidas (desde Resumen por punto)")
+
+    # --- Preparar datos del Excel (búsqueda de columnas sin copiar df) ---
+    df_local = df_entrada
+    colmap = _columnas_entrada(df_local)
+
+    col_x, col_y = colmap["x"], colmap["y"]
+    col_p = colmap["punto"]
+    col_esp = colmap["espacio"]
+
+    if col_x is None or col_y is None:
+        st.warning("No se puede dibujar la vista superior: faltan columnas X/Y en el Excel.")
+        return
+
+    x = pd.to_numeric(df_local[col_x], errors="coerce").to_numpy(dtype=float)
+    y = pd.to_numeric(df_local[col_y], errors="coerce").to_numpy(dtype=float)
+
+    if np.isnan(x).any() or np.isnan(y).any():
+        st.warning("No se puede dibujar la vista superior: hay valores no numéricos en X/Y.")
+        return
+
+    puntos = df_local[col_p].astype(str).str.strip().tolist() if col_p else [f"P{i+1}" for i in range(len(df_local))]
+
+    # --- Tomar Retenidas desde la tabla resumen ---
+    df_r = res["resumen"]
+    colmap_r = _mapa_columnas(df_r)
+
+    col_r_p = _pick_col(colmap_r, ["Punto", "PUNTO"])
+    col_ret = _pick_col(colmap_r, ["Retenidas", "RETENIDAS"])
+    if col_r_p is None or col_ret is None:
+        st.warning("La tabla resumen no trae 'Punto' y/o 'Retenidas'.")
+        return
+
+    claves_r = df_r[col_r_p].astype(str).str.strip().to_numpy()
+    n_ret = pd.to_numeric(df_r[col_ret], errors="coerce").fillna(0).astype(int).to_numpy()
+    mapa_ret = dict(zip(claves_r, n_ret))
+
+    # --- Espacio retenida (SI/NO) del excel ---
+    mapa_esp = {}
+    if col_esp:
+        esp = df_local[col_esp].astype(str).str.strip().str.upper()
+        mapa_esp = dict(zip(puntos, esp.map(_SI_NO_VISTA).fillna(esp)))
+
+    # --- Controles ---
+    L = float(st.slider("Longitud visual de flecha (m)", 5.0, 80.0, 25.0, 1.0))
+    lado_por_defecto = st.selectbox("Lado por defecto si no hay 'Espacio Retenida'", ["IZQUIERDA", "DERECHA"], index=0)
+
+    # Flechas (vectorizado): tangente por diferencias centrales (adelante/atrás
+    # en los extremos) y normal izquierda; la derecha es la opuesta.
+    flechas = []  # bloques (x0, y0, dx, dy)
+    r_arr = np.fromiter((mapa_ret.get(p, 0) for p in puntos), dtype=int, count=len(puntos))
+
+    if len(x) >= 2:
+        tx, ty = np.gradient(x), np.gradient(y)
+        norm = np.hypot(tx, ty)
+        ok = norm > 0
+        norm[~ok] = 1.0
+        nxL, nyL = -ty / norm, tx / norm
+
+        esp = np.array([mapa_esp.get(p, "") for p in puntos], dtype=object)
+        use_left = np.where(esp == "SI", True, np.where(esp == "NO", False, lado_por_defecto == "IZQUIERDA"))
+        lado = np.where(use_left, 1.0, -1.0)
+
+        uno = ok & (r_arr == 1)   # una retenida: lado según Espacio Retenida
+        dos = ok & (r_arr > 1)    # dos o más: ambos lados
+        flechas = [
+            (x[uno], y[uno], lado[uno] * nxL[uno], lado[uno] * nyL[uno]),
+            (x[dos], y[dos], nxL[dos], nyL[dos]),
+            (x[dos], y[dos], -nxL[dos], -nyL[dos]),
+        ]
+
+    if flechas:
+        x0, y0, dx, dy = (np.concatenate(c) for c in zip(*flechas))
+    else:
+        x0 = y0 = dx = dy = np.empty(0)
+
+    # --- Plot (figura cacheada por sus datos de entrada) ---
+    fig = _vista_superior_en_sesion(x, y, tuple(puntos), x0, y0, dx, dy, L)
+    st.pyplot(fig, clear_figure=False)
+
+
+@st.fragment
+def _render_tab_cargas(res: Dict[str, Any]) -> None:
+    _tabla(res["cargas_tramo"], "Cargas por tramo (peso + viento)")
+
+
+@st.fragment
+def _render_tab_fuerzas(res: Dict[str, Any]) -> None:
+    _tabla(res["fuerzas_nodo"], "Fuerzas por poste (suma vectorial)")
+
+
+@st.fragment
+def _render_tab_decision(res: Dict[str, Any]) -> None:
+    _tabla(res["decision"], "Decisión por punto (poste / retenida / autosoportado)")
+
+
+def _normalizar_tipos_poste(tipos: pd.Series) -> pd.Series:
+    """
+    Normaliza tipos de poste en bloque ("pm 40", "PM_40", "PM40" -> "PM-40");
+    vacíos / "nan" -> "". Con dtype category solo se normalizan las
+    categorías (pocas) y se remapean los códigos.
+    """
+    if isinstance(tipos.dtype, pd.CategoricalDtype):
+        cats = tipos.cat.categories
+        mapa = dict(zip(cats, _normalizar_tipos_poste(pd.Series(cats.astype(str)))))
+        return tipos.map(mapa).astype(object).fillna("")
+
+    t = tipos.astype(str).str.strip()
+    t = t.mask(t.eq("nan"), "")
+    t = (
+        t.str.upper()
+        .str.replace(" ", "", regex=False)
+        .str.replace("_", "-", regex=False)
+    )
+    sin_guion = ~t.str.contains("-", regex=False) & (t.str.len() >= 4)  # casos tipo "PM40"
+    return t.where(~sin_guion, t.str[:2] + "-" + t.str[2:])
+
+
+# Máximo aproximado de etiquetas de poste en el perfil
+_MAX_ETIQUETAS_PERFIL = 40
+
+
+def _fig_perfil(
+    X_i: np.ndarray,
+    G_i: np.ndarray,
+    Y_i: np.ndarray,
+    xs: np.ndarray,
+    y_base: np.ndarray,
+    y_top: np.ndarray,
+    y_amarre: np.ndarray,
+    etiquetas: Tuple[str, ...],
+) -> Figure:
+    """Figura del perfil longitudinal (terreno, conductor y postes)."""
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.plot(X_i, G_i, label="Terreno", linewidth=2)
+    ax.plot(X_i, Y_i, label="Conductor", linewidth=2)
+
+    if xs.size:
+        # Un solo artista para todos los postes y otro para los amarres
+        segmentos = np.stack([np.column_stack([xs, y_base]), np.column_stack([xs, y_top])], axis=1)
+        ax.add_collection(LineCollection(segmentos, colors="0.35", linestyles="--", linewidths=2, alpha=0.7))
+        ax.scatter(xs, y_amarre, color="C3", zorder=5)
+
+        # Con muchos postes las etiquetas se solapan: se rotula 1 de cada `paso`
+        paso = max(1, len(etiquetas) // _MAX_ETIQUETAS_PERFIL)
+        for x_pt, y_pt, etiqueta in zip(xs[::paso], y_top[::paso], etiquetas[::paso]):
+            ax.text(x_pt, y_pt + 0.3, etiqueta, ha="center", fontsize=8)
+
+    ax.set_xlabel("Distancia acumulada (m)")
+    ax.set_ylabel("Cota / Altitud (m)")
+    ax.set_title("Perfil longitudinal del conductor")
+    ax.grid(True, linestyle="--", alpha=0.35)
+    ax.legend()
+
+    return fig
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _png_perfil(
+    X_i: np.ndarray,
+    G_i: np.ndarray,
+    Y_i: np.ndarray,
+    xs: np.ndarray,
+    y_base: np.ndarray,
+    y_top: np.ndarray,
+    y_amarre: np.ndarray,
+    etiquetas: Tuple[str, ...],
+) -> bytes:
+    """
+    PNG del perfil cacheado por datos de entrada: en un rerun sin cambios no se
+    construye la figura ni se rasteriza (st.pyplot lo hace en cada rerun).
+    Mismos parámetros de guardado que st.pyplot.
+    """
+    fig = _fig_perfil(X_i, G_i, Y_i, xs, y_base, y_top, y_amarre, etiquetas)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def _limpiar_perfil(
+    X_prof: np.ndarray, G_prof: np.ndarray, Y_prof: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Filtra NaN/inf, ordena por X y deja X estrictamente creciente (para interp)."""
+    # --- limpiar NaN/inf (Streamlit Cloud se rompe si hay NaNs) ---
+    mask = np.isfinite(X_prof) & np.isfinite(G_prof) & np.isfinite(Y_prof)
+    X_prof, G_prof, Y_prof = X_prof[mask], G_prof[mask], Y_prof[mask]
+
+    # Caso habitual (malla del motor): X ya no decreciente (la máscara conserva
+    # el orden); basta quitar X repetidas, sin argsort ni unique (un solo pase)
+    d = np.diff(X_prof)
+    if X_prof.size and np.all(d >= 0):
+        keep = np.empty(X_prof.size, dtype=bool)
+        keep[0] = True
+        np.greater(d, 0, out=keep[1:])
+        return X_prof[keep], G_prof[keep], Y_prof[keep]
+
+    # --- ordenar por X (importante para plot e interp) ---
+    order = np.argsort(X_prof)
+    X_prof, G_prof, Y_prof = X_prof[order], G_prof[order], Y_prof[order]
+
+    # --- asegurar X estrictamente creciente para interp ---
+    X_i, idx = np.unique(X_prof, return_index=True)
+    return X_i, G_prof[idx], Y_prof[idx]
+
+
+def _perfil_limpio_en_sesion(
+    X_prof: np.ndarray, G_prof: np.ndarray, Y_prof: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    _limpiar_perfil con memoria en st.session_state: solo se guarda el último
+    perfil, identificado por forma, dtype y firma blake2b de los bytes de las
+    mallas (O(N), sin ordenar; sumas iguales no bastan para confundirlos).
+    """
+    mallas = (X_prof, G_prof, Y_prof)
+    clave = (
+        tuple((a.shape, a.dtype.str) for a in mallas),
+        _firma_archivo(b"".join(np.ascontiguousarray(a).tobytes() for a in mallas)),
+    )
+    previo = st.session_state.get("_perfil_limpio")
+    if previo is None or previo[0] != clave:
+        previo = (clave, _limpiar_perfil(X_prof, G_prof, Y_prof))
+        st.session_state["_perfil_limpio"] = previo
+    return previo[1]
+
+
+@st.fragment
+def _render_tab_perfil(df: pd.DataFrame, res: Dict[str, Any]) -> None:
+    st.subheader("Perfil longitudinal (si existe Altitud)")
+    perfil = res.get("perfil")
+
+    if not perfil:
+        st.info("No se detectó columna 'Altitud' en el Excel, así que no se calculó el perfil.")
+        return
+
+    # Tabla de vanos
+    df_vanos = perfil.get("tabla_vanos")
+    if isinstance(df_vanos, pd.DataFrame) and not df_vanos.empty:
+        st.dataframe(_format_tabla_vanos(df_vanos), use_container_width=True)
+
+    # Perfil (malla)
+    X_prof = np.asarray(perfil.get("X_prof", []))
+    G_prof = np.asarray(perfil.get("G_prof", []))
+    Y_prof = np.asarray(perfil.get("Y_prof", []))
+
+    if X_prof.size == 0 or G_prof.size == 0 or Y_prof.size == 0:
+        st.warning("No hay datos suficientes para graficar el perfil (X_prof/G_prof/Y_prof vacíos).")
+        return
+
+    # Malla limpia (sin NaN, ordenada, X única); se reutiliza entre reruns
+    # mientras el perfil no cambie
+    X_i, G_i, Y_i = _perfil_limpio_en_sesion(X_prof, G_prof, Y_prof)
+    if X_i.size == 0:
+        st.warning("El perfil quedó vacío tras filtrar NaN/inf.")
+        return
+    if X_i.size < 2:
+        st.warning("No hay suficientes puntos únicos para graficar/interpolar el perfil.")
+        return
+
+    # ============================================================
+    # Preparar postes (opcional) desde df de entrada
+    # ============================================================
+    df_local = df
+    colmap = _columnas_entrada(df_local)
+
+    col_x, col_y = colmap["x"], colmap["y"]
+    col_poste = colmap["poste"]
+    col_punto = colmap["punto"]
+
+    postes = pd.Series(dtype=object)
+    dist_puntos = np.array([], dtype=float)
+
+    if col_x is not None and col_y is not None:
+        x_raw = pd.to_numeric(df_local[col_x], errors="coerce").to_numpy(dtype=float)
+        y_raw = pd.to_numeric(df_local[col_y], errors="coerce").to_numpy(dtype=float)
+
+        if x_raw.size and not (np.isnan(x_raw).any() or np.isnan(y_raw).any()):
+            # Distancia acumulada: hypot + cumsum escrito directo en el resultado
+            dist_puntos = np.empty_like(x_raw)
+            dist_puntos[0] = 0.0
+            np.cumsum(np.hypot(np.diff(x_raw), np.diff(y_raw)), out=dist_puntos[1:])
+
+            if col_poste is not None:
+                postes = df_local[col_poste]
+
+    xs = y_base = y_top = y_amarre = np.empty(0)
+    etiquetas: Tuple[str, ...] = ()
+
+    if len(postes) > 0 and dist_puntos.size > 0:
+        # Interpolar terreno/conductor del perfil en las distancias de puntos
+        G_puntos = np.interp(dist_puntos, X_i, G_i)
+        Y_puntos = np.interp(dist_puntos, X_i, Y_i)
+
+        # Tipos, alturas y etiquetas de todos los postes de una vez
+        n = min(len(postes), len(dist_puntos))
+        tipos = _normalizar_tipos_poste(postes.iloc[:n].reset_index(drop=True))
+        validos = tipos.ne("").to_numpy()
+        h_arr = tipos.map(ALTURA_POSTE_DIBUJO_M).fillna(12.0).to_numpy(dtype=float)
+        if col_punto is not None:
+            rotulos = (df_local[col_punto].iloc[:n].astype(str).reset_index(drop=True) + " " + tipos)
+        else:
+            rotulos = tipos
+
+        idx = np.flatnonzero(validos)
+        xs = dist_puntos[idx]
+        y_base = G_puntos[idx]
+        y_top = y_base + h_arr[idx]
+        y_amarre = Y_puntos[idx]
+        etiquetas = tuple(rotulos.iloc[idx])
+    else:
+        st.caption("Postes no dibujados (falta columna 'Poste' o no se pudo calcular distancia por punto).")
+
+    # ============================================================
+    # Plot perfil (figura cacheada por sus datos de entrada)
+    # ============================================================
+    interactivo = st.checkbox(
+        "Vista interactiva (zoom en el navegador, sin postes)", value=False, key="perfil_interactivo"
+    )
+    if interactivo:
+        # Vega-Lite en el navegador: zoom/hover sin rerenderizar en el servidor
+        datos = pd.DataFrame(
+            {"Terreno": G_i, "Conductor": Y_i},
+            index=pd.Index(X_i, name="Distancia acumulada (m)"),
+        )
+        st.line_chart(datos, x_label="Distancia acumulada (m)", y_label="Cota / Altitud (m)")
+        return
+
+    png = _png_perfil(X_i, G_i, Y_i, xs, y_base, y_top, y_amarre, etiquetas)
+    st.image(png, use_container_width=True)
+
+
+@st.fragment
+def _render_tab_retenidas(res: Dict[str, Any]) -> None:
+    st.subheader("Retenidas (tensión / verificación)")
+
+    df_ret = res.get("retenidas", None)
+    if df_ret is None or df_ret.empty:
+        st.info("No hay resultados de retenidas (o no se calcularon).")
+        return
+
+    st.dataframe(_format_tabla_retenidas(df_ret), use_container_width=True)
+
+    if "Cumple retenida" in df_ret.columns:
+        n = len(df_ret)
+        n_no = int((df_ret["Cumple retenida"] == "NO").sum())
+        n_si = int((df_ret["Cumple retenida"] == "SI").sum())
+        st.caption(f"Cumple: {n_si} / {n}  |  No cumple: {n_no}")
+
+
+def mostrar_tabs_resultados(df: pd.DataFrame, res: Dict[str, Any]) -> None:
+    # Cada pestaña es un fragmento: sus widgets (p. ej. la escala de flechas
+    # en Resumen) solo rerenderizan esa pestaña, sin relanzar main() ni el
+    # cálculo. Streamlit conserva los argumentos para esos reruns parciales.
+    tab0, tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+        ["Entrada", "Resumen por punto", "Cargas por tramo", "Fuerzas por poste", "Decisión", "Retenidas", "Perfil"]
+    )
+
+    with tab0:
+        _render_tab_entrada(df)
+
+    with tab1:
+        _render_tab_resumen(res, df)
+
+    with tab2:
+        _render_tab_cargas(res)
+
+    with tab3:
+        _render_tab_fuerzas(res)
+
+    with tab4:
+        _render_tab_decision(res)
+
+    with tab5:
+        _render_tab_retenidas(res)
+
+    with tab6:
+        _render_tab_perfil(df, res)
+
+
+def mostrar_kpis(res: Dict[str, Any]) -> None:
+    total_m = float(res.get("total_m", 0.0))
+    st.success(f"✅ Longitud total: {total_m:,.2f} m")
+
+
+# ============================================================
+# Main
+# ============================================================
+def main() -> None:
+    configurar_pagina()
+
+    proyecto = ui_datos_proyecto()
+    mostrar_resumen_proyecto(proyecto)
+
+    archivo = ui_cargar_excel()
+    if not archivo:
+        st.stop()
+
+    file_bytes, file_sig = _bytes_en_sesion(archivo)
+
+    try:
+        df = _cached_leer(file_sig, file_bytes)
+        res = ejecutar_calculo(df, proyecto, file_sig)
+
+        mostrar_tabs_resultados(df, res)
+        mostrar_kpis(res)
+
+    except Exception as e:
+        st.error("❌ Error procesando el archivo.")
+        st.exception(e)
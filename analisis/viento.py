@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import math
+import numpy as np
 
 # Aire estándar a nivel del mar (ajustable luego)
 RHO_AIRE = 1.225  # kg/m³
@@ -28,11 +28,18 @@ def viento_kN_m(
     Retorna:
     - w_kN_m: carga horizontal por metro (kN/m)
     """
-    if velocidad_ms <= 0 or diametro_m <= 0:
-        return 0.0
+    return float(viento_kN_m_array(velocidad_ms, diametro_m, Cd=Cd, rho=rho))
 
-    w_N_m = 0.5 * rho * Cd * diametro_m * velocidad_ms ** 2
-    return float(w_N_m / 1000.0)
+
+def viento_kN_m_array(velocidad_ms, diametro_m, Cd: float = 1.2, rho: float = RHO_AIRE) -> np.ndarray:
+    """
+    Versión vectorizada de viento_kN_m (broadcast NumPy sobre v y/o D).
+    Devuelve 0 donde v <= 0 o D <= 0.
+    """
+    v = np.asarray(velocidad_ms, dtype=float)
+    D = np.asarray(diametro_m, dtype=float)
+    w_N_m = 0.5 * rho * Cd * D * v * v
+    return np.where((v > 0) & (D > 0), w_N_m / 1000.0, 0.0)
 
 
 def proyectar_viento(
@@ -51,5 +58,13 @@ def proyectar_viento(
 
     donde theta = az_viento - az_tramo
     """
-    theta = math.radians(azimut_viento_deg - azimut_tramo_deg)
-    return float(abs(w_kN_m * math.sin(theta)))
+    return float(proyectar_viento_array(w_kN_m, azimut_tramo_deg, azimut_viento_deg))
+
+
+def proyectar_viento_array(w_kN_m, azimut_tramo_deg, azimut_viento_deg) -> np.ndarray:
+    """
+    Versión vectorizada de proyectar_viento: w_eff = |w * sin(az_viento - az_tramo)|
+    para todos los tramos a la vez.
+    """
+    theta = np.deg2rad(np.asarray(azimut_viento_deg, dtype=float) - np.asarray(azimut_tramo_deg, dtype=float))
+    return np.abs(np.asarray(w_kN_m, dtype=float) * np.sin(theta))
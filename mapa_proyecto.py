@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import ast
+import json
 import os
 import sys
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Dict, Iterator, List, Tuple
 
 
 EXCLUDE_DIRS = {
@@ -16,6 +20,16 @@ EXCLUDE_DIRS = {
 
 INCLUDE_EXT = {".py"}
 
+# A partir de cuántos archivos por parsear conviene repartir entre procesos
+MIN_ARCHIVOS_PARALELO = 32
+
+# Caché de análisis por archivo, en JSON (nunca pickle: el archivo vive en la
+# raíz analizada y un repo ajeno podría traer uno manipulado):
+#   {"version": N, "archivos": {path: {"firma": [mtime_ns, size], "info": campos de PyInfo}}}
+# Cambiar _CACHE_VERSION si cambia lo que extrae _parse_py.
+CACHE_FILE = ".mapa_cache.json"
+_CACHE_VERSION = 4
+
 
 @dataclass
 class PyInfo:
@@ -79,9 +93,24 @@ def _sig_from_func(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
     return f"def {node.name}({', '.join(args)})"
 
 
+def _nombre_punteado(node: ast.expr) -> str | None:
+    """`Name` / cadena de `Attribute` ("mod.Clase") sin pasar por ast.unparse."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        raiz = _nombre_punteado(node.value)
+        return f"{raiz}.{node.attr}" if raiz is not None else None
+    return None
+
+
 def _sig_from_class(node: ast.ClassDef) -> str:
     bases = []
     for b in node.bases:
+        # caso común (Name / a.b.C) directo; el resto (Generic[T], llamadas...) con unparse
+        nombre = _nombre_punteado(b)
+        if nombre is not None:
+            bases.append(nombre)
+            continue
         try:
             bases.append(ast.unparse(b))
         except Exception:
@@ -90,6 +119,27 @@ def _sig_from_class(node: ast.ClassDef) -> str:
     return f"class {node.name}{base_txt}"
 
 
+# ast.TryStar (try/except*) existe desde Python 3.11
+_TRY_STAR = (ast.TryStar,) if hasattr(ast, "TryStar") else ()
+
+
+def _imports_de_modulo(node: ast.stmt) -> Iterator[ast.Import | ast.ImportFrom]:
+    """
+    Imports de una sentencia de nivel superior, entrando en bloques if/try
+    (body, orelse, handlers, finalbody) pero no en funciones ni clases.
+    """
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        yield node
+    elif isinstance(node, ast.If):
+        for hijo in (*node.body, *node.orelse):
+            yield from _imports_de_modulo(hijo)
+    elif isinstance(node, (ast.Try, *_TRY_STAR)):
+        bloques = [node.body, *(h.body for h in node.handlers), node.orelse, node.finalbody]
+        for bloque in bloques:
+            for hijo in bloque:
+                yield from _imports_de_modulo(hijo)
+
+
 def _parse_py(root: str, path: str) -> PyInfo:
     info = PyInfo(path=path, module=_to_module(root, path))
     try:
@@ -100,24 +150,22 @@ def _parse_py(root: str, path: str) -> PyInfo:
         info.errors.append(f"ParseError: {e}")
         return info
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for n in node.names:
-                info.imports.append(n.name)
-
-        elif isinstance(node, ast.ImportFrom):
-            mod = node.module or ""
-            names = [n.name for n in node.names]
-            info.from_imports.append((mod, names))
+    # Solo nivel superior: tree.body, sin descender a cuerpos de funciones/clases
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.If, ast.Try, *_TRY_STAR)):
+            # imports del módulo, incluidos los de try/except ImportError,
+            # if TYPE_CHECKING: e if __name__ == "__main__":
+            for imp in _imports_de_modulo(node):
+                if isinstance(imp, ast.Import):
+                    info.imports.extend(n.name for n in imp.names)
+                else:
+                    info.from_imports.append((imp.module or "", [n.name for n in imp.names]))
 
         elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # top-level (ast no trae parent; col_offset==0 evita funciones internas)
-            if getattr(node, "col_offset", 1) == 0:
-                info.functions.append(_sig_from_func(node))
+            info.functions.append(_sig_from_func(node))
 
         elif isinstance(node, ast.ClassDef):
-            if getattr(node, "col_offset", 1) == 0:
-                info.classes.append(_sig_from_class(node))
+            info.classes.append(_sig_from_class(node))
 
     # normaliza y quita duplicados preservando orden
     info.imports = uniq(info.imports)
@@ -128,6 +176,68 @@ def _parse_py(root: str, path: str) -> PyInfo:
     return info
 
 
+def _info_desde_json(d: dict) -> PyInfo:
+    """PyInfo desde sus campos en JSON (las tuplas vuelven como listas)."""
+    info = PyInfo(**d)
+    info.from_imports = [(str(mod), list(names)) for mod, names in info.from_imports]
+    return info
+
+
+def _cargar_cache(path: str) -> Dict[str, Tuple[Tuple[int, int], PyInfo]]:
+    """
+    Lee la caché; si no existe, está dañada o es de otra versión, empieza vacía.
+    Las entradas mal formadas se descartan (ese archivo se vuelve a parsear).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+        return {}
+    archivos = data.get("archivos")
+    if not isinstance(archivos, dict):
+        return {}
+
+    cache: Dict[str, Tuple[Tuple[int, int], PyInfo]] = {}
+    for p, entrada in archivos.items():
+        try:
+            mtime_ns, size = entrada["firma"]
+            cache[p] = ((int(mtime_ns), int(size)), _info_desde_json(entrada["info"]))
+        except Exception:
+            continue
+    return cache
+
+
+def _guardar_cache(path: str, infos: List[PyInfo], firmas: Dict[str, Tuple[int, int]]) -> None:
+    archivos = {i.path: {"firma": list(firmas[i.path]), "info": asdict(i)} for i in infos}
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": _CACHE_VERSION, "archivos": archivos}, f, ensure_ascii=False)
+    except OSError:
+        pass  # sin permiso de escritura: el mapa se genera igual
+
+
+def _firma_stat(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_varios(root: str, paths: List[str]) -> List[PyInfo]:
+    """
+    _parse_py sobre varios archivos. Con muchos archivos se reparte entre
+    procesos (ast.parse es CPU puro); con pocos, arrancar el pool no compensa.
+    """
+    if len(paths) <= MIN_ARCHIVOS_PARALELO:
+        return [_parse_py(root, p) for p in paths]
+    try:
+        with ProcessPoolExecutor() as ex:
+            return list(ex.map(partial(_parse_py, root), paths, chunksize=8))
+    except (OSError, BrokenProcessPool):
+        # entorno sin procesos hijos disponibles: en serie
+        return [_parse_py(root, p) for p in paths]
+
+
 def _walk_py_files(root: str) -> List[str]:
     py_files = []
     for base, dirs, files in os.walk(root):
@@ -162,21 +272,28 @@ def _tree_view(root: str, files: List[str]) -> str:
 
 def generar_mapa(root: str, out_md: str = "MAPA_DEL_PROYECTO.md") -> str:
     files = _walk_py_files(root)
-    infos = [_parse_py(root, p) for p in files]
+
+    # Solo se re-parsean archivos nuevos o modificados desde la última corrida
+    cache_path = os.path.join(root, CACHE_FILE)
+    cache = _cargar_cache(cache_path)
+    firmas = {p: _firma_stat(p) for p in files}
+    pendientes = [p for p in files if p not in cache or cache[p][0] != firmas[p]]
+    parseados = dict(zip(pendientes, _parse_varios(root, pendientes)))
+
+    infos = [parseados[p] if p in parseados else cache[p][1] for p in files]
+    _guardar_cache(cache_path, infos, firmas)
 
     by_mod: Dict[str, PyInfo] = {i.module: i for i in infos}
 
+    # Paquetes locales: todos los prefijos con punto de los módulos
+    # ("analisis" para "analisis.engine"), una vez, para consultar en O(1)
+    paquetes = {m[:k] for m in by_mod for k, ch in enumerate(m) if ch == "."}
+    locales = paquetes | set(by_mod)
+
     deps: Dict[str, List[str]] = {}
     for i in infos:
-        local = []
-        for imp in i.imports:
-            if imp in by_mod or any((imp + ".") == m[: len(imp) + 1] for m in by_mod):
-                local.append(imp)
-        for mod, _names in i.from_imports:
-            if not mod:
-                continue
-            if mod in by_mod or any((mod + ".") == m[: len(mod) + 1] for m in by_mod):
-                local.append(mod)
+        local = [imp for imp in i.imports if imp in locales]
+        local += [mod for mod, _names in i.from_imports if mod and mod in locales]
         deps[i.module] = uniq(local)
 
     lines: List[str] = []